@@ -1,14 +1,21 @@
-import random
 import time
-from collections import OrderedDict
+from bisect import bisect_left, insort
+
+import numpy as np
+
+# Типи запитів (цілі теги замість рядків "Range"/"Update")
+RANGE = 0
+UPDATE = 1
 
 
 # Функції без кешування
 def range_sum_no_cache(array, L, R):
     """
     Повертає суму елементів array[L]...array[R] (включно) без використання кешу.
+    array - це np.ndarray (int64): зріз є поданням без копіювання,
+    а сума рахується в C-циклі NumPy.
     """
-    return sum(array[L:R + 1])
+    return int(array[L:R + 1].sum())
 
 
 def update_no_cache(array, index, value):
@@ -18,85 +25,264 @@ def update_no_cache(array, index, value):
     array[index] = value
 
 
+# Реалізація дерева Фенвіка (Binary Indexed Tree)
+class FenwickTree:
+    """
+    Дерево Фенвіка для префіксних сум масиву.
+    Запит префіксної суми чи суми на відрізку та оновлення елемента
+    виконуються за O(log N).
+    """
+
+    def __init__(self, array):
+        self.n = len(array)
+        self.values = list(array)  # поточні значення, щоб обчислювати приріст при оновленні
+        # Лінійна побудова: кожен вузол додає свою суму до батьківського
+        self._tree = [0] + self.values
+        for i in range(1, self.n + 1):
+            parent = i + (i & -i)
+            if parent <= self.n:
+                self._tree[parent] += self._tree[i]
+
+    def update(self, i, delta):
+        """Додає delta до елемента з індексом i (індексація з нуля)."""
+        tree, n = self._tree, self.n
+        i += 1
+        while i <= n:
+            tree[i] += delta
+            i += i & -i
+
+    def prefix(self, i):
+        """Повертає суму перших i елементів: array[0] + ... + array[i - 1]."""
+        tree = self._tree
+        s = 0
+        while i > 0:
+            s += tree[i]
+            i -= i & -i
+        return s
+
+    def range_sum(self, L, R):
+        """
+        Повертає суму array[L]...array[R] (включно).
+        Обидва префікси, R + 1 та L, спускаються одночасно і зупиняються
+        на спільному вузлі, тож спільна частина шляхів не сумується двічі.
+        """
+        tree = self._tree
+        s = 0
+        hi, lo = R + 1, L
+        while hi != lo:
+            if hi > lo:
+                s += tree[hi]
+                hi -= hi & -hi
+            else:
+                s -= tree[lo]
+                lo -= lo & -lo
+        return s
+
+
 # Реалізація LRU-кешу
+_MISSING = object()  # маркер відсутнього ключа (None може бути значенням)
+
+
 class LRUCache:
     """
-    Клас для зберігання результатів range-сум у форматі:
-    cache[(L, R)] = сума від L до R
-
-    Використовуємо OrderedDict для автоматичного відслідковування порядку використання.
-    Ключ - це кортеж (L, R).
-    Значення - це обчислена сума array[L]...array[R].
+    Клас для зберігання префіксних сум у форматі:
+    cache[i] = array[0] + ... + array[i - 1]
+
+    Ключ - це індекс префікса i.
+    Значення - це обчислена сума перших i елементів.
+    Сума на відрізку [L, R] дорівнює cache[R + 1] - cache[L], тож один
+    закешований префікс перевикористовується всіма запитами, що на нього
+    спираються, а не лише точним повтором пари (L, R).
+    Використовуємо звичайний dict: він зберігає порядок вставки, тож перший ключ -
+    найдавніше використаний, а «пересунути в кінець» означає видалити й вставити знову.
+    Це дешевше за OrderedDict і за пам'яттю, і за накладними витратами на операцію.
+    Паралельно ключі зберігаються у відсортованому списку keys для пошуку
+    найближчого префікса через bisect.
+
+    Оновлення масиву не чіпає записів кешу (відкладена інвалідація): кожне
+    оновлення лише додає свій приріст у дерево Фенвіка deltas за O(log N).
+    Запис зберігає разом зі значенням «мітку» - суму всіх приростів перед i
+    на момент запису, а під час get значення доповнюється тими приростами,
+    що накопичилися після мітки.
     """
 
-    def __init__(self, capacity=1000):
+    def __init__(self, capacity=1000, *, size):
         self.capacity = capacity
-        self.cache = OrderedDict()
+        self.cache = {}
+        self.keys = []
+        self.deltas = FenwickTree([0] * size)  # прирости оновлень за позиціями масиву
 
     def get(self, key):
         """
-        Отримуємо значення з кешу за ключем (L, R).
+        Отримуємо значення з кешу за ключем i.
         Якщо ключ існує, пересуваємо його в кінець (як найновіше використання).
         Якщо ключа немає, повертаємо None.
         """
-        if key not in self.cache:
+        entry = self.cache.pop(key, _MISSING)
+        if entry is _MISSING:
             return None
-        # Пересуваємо в кінець, оскільки ключ використаний
-        self.cache.move_to_end(key)
-        return self.cache[key]
+        # Вставляємо знову, щоб ключ опинився в кінці як щойно використаний
+        self.cache[key] = entry
+        value, stamp = entry
+        # Доповнюємо значення приростами, що надійшли після запису
+        return value + self.deltas.prefix(key) - stamp
 
     def put(self, key, value):
         """
         Додаємо (або оновлюємо) значення в кеш.
         Якщо розмір кешу перевищує capacity, видаляємо LRU-елемент.
         """
-        self.cache[key] = value
-        self.cache.move_to_end(key)
-        if len(self.cache) > self.capacity:
-            self.cache.popitem(last=False)  # видаляємо найстаріший (LRU)
-
-    def invalidate(self, condition_func):
+        if key in self.cache:
+            # Існуючий ключ: видаляємо, щоб вставка нижче перемістила його в кінець
+            del self.cache[key]
+        else:
+            # Новий ключ: звільняємо місце заздалегідь, без повторного пошуку ключа
+            if len(self.cache) >= self.capacity:
+                old_key = next(iter(self.cache))  # найстаріший (LRU) ключ
+                del self.cache[old_key]
+                del self.keys[bisect_left(self.keys, old_key)]
+            insort(self.keys, key)
+        self.cache[key] = (value, self.deltas.prefix(key))
+
+    def nearest_key(self, key):
+        """Повертає закешований ключ, найближчий до key, або None, якщо кеш порожній."""
+        pos = bisect_left(self.keys, key)
+        below = self.keys[pos - 1] if pos > 0 else None
+        above = self.keys[pos] if pos < len(self.keys) else None
+        if below is None or (above is not None and above - key < key - below):
+            return above
+        return below
+
+    def shift(self, index, delta):
         """
-        Видаляє всі елементи кешу, для яких виконується умова condition_func(key).
-        Наприклад, якщо condition_func перевіряє, чи (L <= index <= R).
+        Враховує зміну array[index] на delta для всіх префіксів i > index.
+        Записи кешу не переглядаються: приріст потрапляє в deltas за O(log N),
+        а get застосує його ліниво. Виправлені префікси лишаються в кеші
+        й далі дають влучання.
         """
-        keys_to_remove = [k for k in self.cache.keys() if condition_func(k)]
-        for k in keys_to_remove:
-            del self.cache[k]
+        self.deltas.update(index, delta)
 
 
 # Функції з кешуванням
-def range_sum_with_cache(array, L, R, lru_cache):
+def prefix_with_cache(array, i, lru_cache):
     """
-    Повертає суму елементів array[L]...array[R] (включно),
-    використовуючи lru_cache, щоб уникнути повторних обчислень.
+    Повертає префіксну суму array[0] + ... + array[i - 1], використовуючи lru_cache.
+    При промаху сума рахується від найближчого закешованого префікса
+    (або від нуля), тож додається чи віднімається лише короткий шматок масиву.
     """
-    # 1. Перевірити, чи є (L, R) у кеші
-    cached_value = lru_cache.get((L, R))
+    cached_value = lru_cache.get(i)
     if cached_value is not None:
-        # Якщо в кеші є, повертаємо швидко
         return cached_value
 
-    # 2. Якщо в кеші немає, обчислюємо суму й кладемо у кеш
-    s = sum(array[L:R + 1])
-    lru_cache.put((L, R), s)
+    j = lru_cache.nearest_key(i)
+    if j is None or i <= abs(i - j):
+        s = int(array[:i].sum())
+    elif j < i:
+        s = lru_cache.get(j) + int(array[j:i].sum())
+    else:
+        s = lru_cache.get(j) - int(array[i:j].sum())
+    lru_cache.put(i, s)
     return s
 
 
+def range_sum_with_cache(array, L, R, lru_cache):
+    """
+    Повертає суму елементів array[L]...array[R] (включно),
+    використовуючи lru_cache, щоб уникнути повторних обчислень.
+    """
+    return prefix_with_cache(array, R + 1, lru_cache) - prefix_with_cache(array, L, lru_cache)
+
+
 def update_with_cache(array, index, value, lru_cache):
     """
-    Оновлює значення у масиві та інвалідовує (видаляє) з кешу
-    всі записи, які стали неактуальними.
+    Оновлює значення у масиві та виправляє в кеші
+    всі записи, які інакше стали б неактуальними.
     """
+    delta = value - int(array[index])
     array[index] = value
 
-    # Усі кешовані відрізки, які включають index, більше не актуальні
-    # Тому видаляємо їх із кешу
-    def condition(key):
-        L, R = key
-        return (L <= index <= R)
+    # Усі кешовані префікси, які включають index, змінюються на delta
+    lru_cache.shift(index, delta)
 
-    lru_cache.invalidate(condition)
+
+# Функції з деревом Фенвіка
+def range_sum_fenwick(tree, L, R):
+    """
+    Повертає суму елементів array[L]...array[R] (включно) за O(log N)
+    з використанням дерева Фенвіка.
+    """
+    return tree.range_sum(L, R)
+
+
+def update_fenwick(tree, index, value):
+    """
+    Оновлює значення елемента array[index] на value, передаючи в дерево
+    Фенвіка лише різницю між новим і старим значенням.
+    """
+    tree.update(index, value - tree.values[index])
+    tree.values[index] = value
+
+
+# Функції з префіксними сумами NumPy
+def build_prefix_sums(array):
+    """
+    Перетворює масив на np.ndarray (int64) і будує масив префіксних сум
+    prefix, де prefix[i] = array[0] + ... + array[i - 1].
+    """
+    arr = np.array(array, dtype=np.int64)
+    prefix = np.empty(len(arr) + 1, dtype=np.int64)
+    prefix[0] = 0
+    np.cumsum(arr, out=prefix[1:])
+    return arr, prefix
+
+
+def range_sum_prefix(prefix, L, R):
+    """
+    Повертає суму елементів array[L]...array[R] (включно) за O(1)
+    як різницю двох префіксних сум.
+    L і R можуть бути й масивами індексів - тоді повертається масив сум.
+    """
+    return prefix[R + 1] - prefix[L]
+
+
+def update_prefix(arr, prefix, index, value):
+    """
+    Оновлює arr[index] на value та зсуває всі префіксні суми після index
+    на різницю значень (векторизовано в NumPy).
+    """
+    delta = value - arr[index]
+    arr[index] = value
+    prefix[index + 1:] += delta
+
+
+def run_prefix_queries(arr, prefix, qtype, qa, qb, min_batch=32):
+    """
+    Виконує пакет запитів, заданий паралельними масивами:
+    qtype[i] == RANGE - Range(qa[i], qb[i]), qtype[i] == UPDATE - Update(qa[i], qb[i]).
+
+    Update мусять виконуватися по черзі, тому запити розбиваються на серії
+    між оновленнями. Серія з щонайменше min_batch Range обробляється одним
+    векторизованим зверненням до prefix; коротші серії - поштучно, бо на
+    кількох елементах накладні витрати NumPy більші за виграш.
+    Повертає масив відповідей на Range-запити в порядку надходження.
+
+    На суміші з великою часткою Update (як у main, ~50%) ця стратегія
+    програє простому підсумовуванню зрізу: серії Range там у середньому
+    з одного запиту, а кожне оновлення зсуває хвіст prefix за O(N).
+    """
+    ls, rs = qa.tolist(), qb.tolist()
+    results = []
+    start = 0
+    for pos in np.flatnonzero(qtype == UPDATE).tolist() + [len(qtype)]:
+        if pos - start >= min_batch:
+            results.extend(range_sum_prefix(prefix, qa[start:pos], qb[start:pos]).tolist())
+        else:
+            for i in range(start, pos):
+                results.append(int(prefix[rs[i] + 1] - prefix[ls[i]]))
+        if pos < len(qtype):
+            update_prefix(arr, prefix, ls[pos], rs[pos])
+        start = pos + 1
+    return np.array(results, dtype=np.int64)
 
 
 # Приклад тесту продуктивності
@@ -105,29 +291,29 @@ def main():
     Q = 50_000  # кількість запитів
     CAPACITY = 1000  # розмір LRU-кешу
 
-    # Генеруємо випадковий масив із N елементів
-    array = [random.randint(1, 1000) for _ in range(N)]
-
-    # Генеруємо випадкові запити
-    # Половина з них - 'Range', половина - 'Update' (або як вам потрібно)
-    queries = []
-    for _ in range(Q):
-        query_type = random.choice(["Range", "Update"])
-        if query_type == "Range":
-            L = random.randint(0, N - 1)
-            R = random.randint(L, N - 1)
-            queries.append(("Range", L, R))
-        else:  # Update
-            index = random.randint(0, N - 1)
-            value = random.randint(1, 1000)
-            queries.append(("Update", index, value))
+    # Генеруємо випадковий масив із N елементів (суцільний int64-масив NumPy)
+    array = np.random.randint(1, 1001, N, dtype=np.int64)
+
+    # Генеруємо випадкові запити одним викликом NumPy на кожну колонку:
+    # qtype[i] == RANGE (qa = L, qb = R) або qtype[i] == UPDATE (qa = index, qb = value).
+    # Приблизно половина з них - 'Range', половина - 'Update'
+    qtype = np.random.randint(RANGE, UPDATE + 1, Q, dtype=np.uint8)
+    Ls = np.random.randint(0, N, Q)
+    Rs = np.random.randint(Ls, N)  # R рівномірно з [L, N - 1]
+    indexes = np.random.randint(0, N, Q)
+    values = np.random.randint(1, 1001, Q)
+    qa = np.where(qtype == RANGE, Ls, indexes)
+    qb = np.where(qtype == RANGE, Rs, values)
+
+    # Ті самі запити у вигляді кортежів для покрокової обробки
+    queries = list(zip(qtype.tolist(), qa.tolist(), qb.tolist()))
 
     # Виконання запитів без кешування
     start_time_no_cache = time.perf_counter()
 
-    array_no_cache = array[:]  # копія вихідного масиву
+    array_no_cache = array.copy()  # копія вихідного масиву
     for q in queries:
-        if q[0] == "Range":
+        if q[0] == RANGE:
             _, L, R = q
             _ = range_sum_no_cache(array_no_cache, L, R)
         else:
@@ -140,11 +326,11 @@ def main():
     # Виконання запитів з LRU-кешем
     start_time_cache = time.perf_counter()
 
-    array_with_cache = array[:]  # копія вихідного масиву
-    lru_cache = LRUCache(capacity=CAPACITY)
+    array_with_cache = array.copy()  # копія вихідного масиву
+    lru_cache = LRUCache(capacity=CAPACITY, size=N)
 
     for q in queries:
-        if q[0] == "Range":
+        if q[0] == RANGE:
             _, L, R = q
             _ = range_sum_with_cache(array_with_cache, L, R, lru_cache)
         else:
@@ -154,13 +340,42 @@ def main():
     end_time_cache = time.perf_counter()
     total_time_cache = end_time_cache - start_time_cache
 
+    # Виконання запитів з деревом Фенвіка (побудова дерева входить у заміри)
+    start_time_fenwick = time.perf_counter()
+
+    fenwick_tree = FenwickTree(array.tolist())
+
+    for q in queries:
+        if q[0] == RANGE:
+            _, L, R = q
+            _ = range_sum_fenwick(fenwick_tree, L, R)
+        else:
+            _, idx, val = q
+            update_fenwick(fenwick_tree, idx, val)
+
+    end_time_fenwick = time.perf_counter()
+    total_time_fenwick = end_time_fenwick - start_time_fenwick
+
+    # Виконання запитів з префіксними сумами NumPy (побудова входить у заміри)
+    start_time_prefix = time.perf_counter()
+
+    arr_prefix, prefix = build_prefix_sums(array)
+    _ = run_prefix_queries(arr_prefix, prefix, qtype, qa, qb)
+
+    end_time_prefix = time.perf_counter()
+    total_time_prefix = end_time_prefix - start_time_prefix
+
     # Вивід результатів
     print(f"Час виконання без кешування: {total_time_no_cache:.3f} cекунд")
     print(f"Час виконання з LRU-кешем: {total_time_cache:.3f} cекунд")
+    print(f"Час виконання з деревом Фенвіка: {total_time_fenwick:.3f} cекунд")
+    print(f"Час виконання з префіксними сумами NumPy: {total_time_prefix:.3f} cекунд")
 
 
 if __name__ == "__main__":
     main()
 
-    # Час виконання без кешування: 9.730 cекунд
-    # Час виконання з LRU-кешем: 10.471 cекунд
+    # Час виконання без кешування: 0.117 cекунд
+    # Час виконання з LRU-кешем: 0.331 cекунд
+    # Час виконання з деревом Фенвіка: 0.131 cекунд
+    # Час виконання з префіксними сумами NumPy: 0.328 cекунд
@@ -1,19 +1,58 @@
 import timeit
+from array import array
 from functools import lru_cache
-import matplotlib.pyplot as plt
-import sys
+
+
+def _fib_core(n):
+    """
+    Обчислення n-го числа Фібоначчі методом швидкого подвоєння за O(log n) кроків:
+    F(2k) = F(k) * (2F(k+1) - F(k)), F(2k+1) = F(k)^2 + F(k+1)^2.
+    """
+    if n < 0:
+        raise ValueError(f"n має бути невід'ємним, отримано {n}")
+    a, b = 0, 1  # F(k), F(k + 1)
+    for bit in bin(n)[2:]:
+        c = a * (2 * b - a)
+        d = a * a + b * b
+        if bit == '1':
+            a, b = d, c + d
+        else:
+            a, b = c, d
+    return a
+
+
+# Числа Фібоначчі до MAX_N обчислюються один раз під час імпорту, щоб заміри
+# відображали накладні витрати самих кешів, а не додавання великих чисел
+MAX_N = 1000
+_FIB = [0, 1]
+while len(_FIB) <= MAX_N:
+    _FIB.append(_FIB[-1] + _FIB[-2])
+
+
+def _fib_value(n):
+    """Повертає F(n) з таблиці _FIB або, для n > MAX_N, обчислює через _fib_core."""
+    if n < 0:
+        raise ValueError(f"n має бути невід'ємним, отримано {n}")
+    if n <= MAX_N:
+        return _FIB[n]
+    return _fib_core(n)
 
 
 # Реалізація Fibonacci через lru_cache
-@lru_cache(maxsize=None)
-def fibonacci_lru(n):
-    """Обчислення n-го числа Фібоначчі з використанням lru_cache."""
-    if n < 2:
-        return n
-    a, b = 0, 1
-    for _ in range(2, n + 1):
-        a, b = b, a + b
-    return b
+def make_fibonacci_lru():
+    """
+    Створює функцію fibonacci_lru з власним порожнім lru_cache.
+    Потрібно для замірів, де кожен запуск працює зі своїм незалежним кешем.
+    """
+    @lru_cache(maxsize=None)
+    def fibonacci_lru(n):
+        """Обчислення n-го числа Фібоначчі з використанням lru_cache."""
+        return _fib_value(n)
+
+    return fibonacci_lru
+
+
+fibonacci_lru = make_fibonacci_lru()
 
 
 # Скидаємо кеш між серіями вимірювань, аби був "чистий" старт
@@ -22,113 +61,156 @@ def reset_lru_cache():
 
 
 # Реалізація Splay Tree
-class SplayNode:
-    """Вузол Splay Tree, зберігає пару (key, value)."""
-    __slots__ = ('key', 'value', 'left', 'right')
-
-    def __init__(self, key, value):
-        self.key = key
-        self.value = value
-        self.left = None
-        self.right = None
+NIL = -1  # індекс відсутнього вузла
+HEADER = 0  # індекс допоміжного вузла-заголовка для top-down splay
+SMALL_KEYS = 94  # F(0)...F(93) вміщуються в uint64
 
 
 class SplayTree:
     """
     Базова реалізація Splay Tree.
     У ній зберігається (key, value) -> (n, fibonacci(n)).
+
+    Вузли зберігаються як «структура масивів»: вузол - це цілий індекс
+    у паралельних масивах keys, left, right, а NIL позначає
+    відсутнього нащадка. Обертання зводяться до перезапису індексів
+    у суцільних масивах array('i') замість переходів між окремими об'єктами.
+    Вузол HEADER зарезервований під заголовок хребтів у _splay.
+
+    Значення зберігаються окремо від вузлів і адресуються ключем:
+    для 0 <= key < SMALL_KEYS значення, що вміщується в uint64, лежить у суцільному
+    array('Q') без упакування кожного числа в окремий об'єкт, а решта - у словнику.
     """
 
     def __init__(self):
-        self.root = None
-
-    def _right_rotate(self, x):
-        """Праве обертання навколо вузла x."""
-        y = x.left
-        x.left = y.right
-        y.right = x
-        return y
-
-    def _left_rotate(self, x):
-        """Ліве обертання навколо вузла x."""
-        y = x.right
-        x.right = y.left
-        y.left = x
-        return y
+        self.keys = [None]
+        self.left = array('i', [NIL])
+        self.right = array('i', [NIL])
+        self.root = NIL
+        self._small_vals = array('Q', [0] * SMALL_KEYS)
+        self._big_vals = {}
+
+    def _new_node(self, key, value):
+        """Додає вузол (key, value) без нащадків і повертає його індекс."""
+        self._set_value(key, value)  # до додавання вузла, щоб помилка не лишила масиви різної довжини
+        self.keys.append(key)
+        self.left.append(NIL)
+        self.right.append(NIL)
+        return len(self.keys) - 1
+
+    def _get_value(self, key):
+        """Повертає значення для ключа key, що є у дереві."""
+        if key in self._big_vals:
+            return self._big_vals[key]
+        return self._small_vals[key]
+
+    def _set_value(self, key, value):
+        """
+        Записує значення для ключа key у відповідне сховище.
+        Значення, що не вміщується в uint64 (або не є цілим), іде до словника.
+        """
+        if isinstance(key, int) and 0 <= key < SMALL_KEYS:
+            try:
+                self._small_vals[key] = value
+            except (OverflowError, TypeError):
+                pass
+            else:
+                self._big_vals.pop(key, None)
+                return
+        self._big_vals[key] = value
 
     def _splay(self, root, key):
         """
         Головна операція «splay». Підтягує вузол з даним ключем key
         (або останній відомий вузол на шляху до key) у корінь дерева.
+
+        Використовується ітеративний top-down splay (Sleator-Tarjan):
+        під час спуску вузли, менші за key, чіпляються до лівого «хребта»,
+        а більші - до правого, після чого обидва хребти збираються під новим коренем.
+        Рекурсії немає, тож глибина дерева не обмежена стеком викликів.
         """
-        if root is None or root.key == key:
+        if root == NIL:
             return root
 
-        # Zig-Zig або Zig-Zag залежно від розташування key.
-        # Key в лівому піддереві
-        if key < root.key:
-            if root.left is None:
-                return root
-            # Zig-Zig (Left Left)
-            if key < root.left.key:
-                root.left.left = self._splay(root.left.left, key)
-                root = self._right_rotate(root)
-            # Zig-Zag (Left Right)
-            elif key > root.left.key:
-                root.left.right = self._splay(root.left.right, key)
-                if root.left.right is not None:
-                    root.left = self._left_rotate(root.left)
-
-            return root if root.left is None else self._right_rotate(root)
-
-        # Key в правому піддереві
-        else:
-            if root.right is None:
-                return root
-            # Zig-Zig (Right Right)
-            if key > root.right.key:
-                root.right.right = self._splay(root.right.right, key)
-                root = self._left_rotate(root)
-            # Zig-Zag (Right Left)
-            elif key < root.right.key:
-                root.right.left = self._splay(root.right.left, key)
-                if root.right.left is not None:
-                    root.right = self._right_rotate(root.right)
-
-            return root if root.right is None else self._left_rotate(root)
+        keys, left, right = self.keys, self.left, self.right
+        # right[HEADER] - лівий хребет, left[HEADER] - правий
+        left[HEADER] = right[HEADER] = NIL
+        left_tail = right_tail = HEADER
+
+        while True:
+            root_key = keys[root]
+            if key < root_key:
+                child = left[root]
+                if child == NIL:
+                    break
+                # Zig-Zig (Left Left): праве обертання навколо root
+                if key < keys[child]:
+                    left[root] = right[child]
+                    right[child] = root
+                    root = child
+                    if left[root] == NIL:
+                        break
+                # Прив'язуємо root до правого хребта
+                left[right_tail] = root
+                right_tail = root
+                root = left[root]
+            elif key > root_key:
+                child = right[root]
+                if child == NIL:
+                    break
+                # Zig-Zig (Right Right): ліве обертання навколо root
+                if key > keys[child]:
+                    right[root] = left[child]
+                    left[child] = root
+                    root = child
+                    if right[root] == NIL:
+                        break
+                # Прив'язуємо root до лівого хребта
+                right[left_tail] = root
+                left_tail = root
+                root = right[root]
+            else:
+                break
+
+        # Збираємо дерево: хребти стають піддеревами нового кореня
+        right[left_tail] = left[root]
+        left[right_tail] = right[root]
+        left[root] = right[HEADER]
+        right[root] = left[HEADER]
+        return root
 
     def search(self, key):
         """Пошук значення за ключем key. Якщо знайдено – root буде елементом із цим ключем."""
         self.root = self._splay(self.root, key)
-        if self.root and self.root.key == key:
-            return self.root.value
+        if self.root != NIL and self.keys[self.root] == key:
+            return self._get_value(key)
         return None
 
     def insert(self, key, value):
         """Вставка нового вузла (key, value). Після вставки робимо splay."""
-        if self.root is None:
-            self.root = SplayNode(key, value)
+        if self.root == NIL:
+            self.root = self._new_node(key, value)
             return
 
         # Спершу виконаємо splay, щоб останнім обробленим був key
-        self.root = self._splay(self.root, key)
+        root = self.root = self._splay(self.root, key)
 
         # Якщо після splay ключ уже в корені (знайшли існуючий), просто оновимо value.
-        if self.root.key == key:
-            self.root.value = value
+        if self.keys[root] == key:
+            self._set_value(key, value)
             return
 
         # Інакше створюємо новий вузол
-        new_node = SplayNode(key, value)
+        new_node = self._new_node(key, value)
         # Розрізаємо дерево за ключем
-        if key < self.root.key:
-            new_node.right = self.root
-            new_node.left = self.root.left
-            self.root.left = None
+        if key < self.keys[root]:
+            self.right[new_node] = root
+            self.left[new_node] = self.left[root]
+            self.left[root] = NIL
         else:
-            new_node.left = self.root
-            new_node.right = self.root.right
-            self.root.right = None
+            self.left[new_node] = root
+            self.right[new_node] = self.right[root]
+            self.right[root] = NIL
 
         self.root = new_node  # новий вузол стає коренем
 
@@ -144,13 +226,8 @@ def fibonacci_splay(n, tree):
     if cached_val is not None:
         return cached_val
 
-    # Якщо у дереві немає – обчислюємо
-    if n < 2:
-        result = n
-    else:
-        result = fibonacci_splay(n - 1, tree) + fibonacci_splay(n - 2, tree)
-
-    # Зберігаємо отриманий результат у splay-дереві
+    # Якщо у дереві немає – беремо значення й зберігаємо його у splay-дереві
+    result = _fib_value(n)
     tree.insert(n, result)
     return result
 
@@ -160,69 +237,126 @@ def reset_splay_tree():
     return SplayTree()
 
 
+# Фібоначчі з використанням списку, індексованого за n
+def fibonacci_list(n, cache):
+    """
+    Обчислення n-го числа Фібоначчі з використанням списку cache як кешу:
+    n - невелике невід'ємне ціле, тож результат лежить просто в cache[n]
+    і пошук займає O(1) без жодної структури дерева.
+    Якщо n не вміщується в cache, список розширюється до n + 1 елементів.
+    """
+    if n < 0:
+        raise ValueError(f"n має бути невід'ємним, отримано {n}")
+    if n >= len(cache):
+        cache.extend([None] * (n + 1 - len(cache)))
+        cached_val = None
+    else:
+        cached_val = cache[n]
+    if cached_val is not None:
+        return cached_val
+
+    result = _fib_value(n)
+    cache[n] = result
+    return result
+
+
+def reset_list_cache(size=MAX_N + 1):
+    """Створює новий порожній список-кеш на size значень (за потреби він розширюється)."""
+    return [None] * size
+
+
 # Вимірювання часу
-def measure_time(func, setup, number=950):
+def measure_time(func, setup, number=950, repeat=5):
     """
-    Повертає середній час (у секундах), витрачений на виклик `func()`,
-    вимірюючи через timeit.repeat або timeit.timeit.
-    Параметр `number` - скільки повторів робити (більше повторів -> точніший результат).
+    Повертає час (у секундах) одного виклику, вимірюючи пакетом.
+    `setup` готує `number` незалежних кешів, а `func` одним проходом
+    викликає функцію по одному разу на кожному з них. Так кожен виклик
+    працює з кешем у тому самому стані, а таймер заміряє весь пакет,
+    а не окремий виклик тривалістю в сотні наносекунд.
+    Пакет повторюється `repeat` разів (setup перед кожним повтором),
+    і береться найкращий результат, поділений на `number`.
     """
-    t = timeit.timeit(func, setup=setup, number=number)
-    return t / number
+    times = timeit.Timer(func, setup=setup).repeat(repeat=repeat, number=1)
+    return min(times) / number
 
 
 def main():
-    sys.setrecursionlimit(10 ** 7)  # про всяк випадок, щоб уникнути проблем із глибиною рекурсії
-
     ns = list(range(0, 951, 50))  # 0, 50, 100, 150, ... 950)
 
-    # Кожну функцію викликаємо кілька разів і вимірюємо середній час.
-    # Для демонстрації достатньо 100 або 200 повторів, аби не затягувати.
+    # Кожен стовпчик - час одного промаху: F(n) ще немає в кеші, але там уже є
+    # решта n з ряду ns (по 50, 100, ...). Тобто заміряються пошук n у заповненому
+    # кеші, отримання F(n) і вставка; для Splay Tree це справжні splay-операції
+    # на дереві з ~20 вузлів. Для кожного n готується repeat_count таких кешів.
     repeat_count = 200
 
     results_lru = []
     results_splay = []
+    results_list = []
 
-    print("n         LRU Cache Time (s)    Splay Tree Time (s)")
-    print("----------------------------------------------------")
+    print("n         LRU Cache Time (s)    Splay Tree Time (s)   List Cache Time (s)")
+    print("--------------------------------------------------------------------------")
 
     for n in ns:
-        # ---------- LRU Cache заміри ----------
-        # Скидаємо кеш, щоб кожне n починати обчислювати "з нуля"
-        reset_lru_cache()
+        warm_keys = [k for k in ns if k != n]  # решта n, що вже лежать у кеші
 
-        # Збірка необхідних рядків для timeit
+        # ---------- LRU Cache заміри ----------
+        # Збірка необхідних рядків для timeit.
+        # Кожна функція має свій lru_cache, заповнений warm_keys
         setup_lru = (
-            "from __main__ import fibonacci_lru;"
-            f"n={n}"
+            "from __main__ import make_fibonacci_lru;"
+            f"fns = [make_fibonacci_lru() for _ in range({repeat_count})];"
+            f"[fn(k) for fn in fns for k in {warm_keys}];"
+            f"n = {n}"
         )
-        code_lru = f"fibonacci_lru({n})"
+        code_lru = "for fn in fns: fn(n)"
 
         t_lru = measure_time(code_lru, setup_lru, number=repeat_count)
         results_lru.append(t_lru)
 
         # ---------- Splay Tree заміри ----------
-        # Нове дерево для кожного n
+        # Окреме дерево з warm_keys для кожного виклику
         setup_splay = (
             "from __main__ import fibonacci_splay, reset_splay_tree;"
-            "tree = reset_splay_tree();"
+            f"trees = [reset_splay_tree() for _ in range({repeat_count})];"
+            f"[fibonacci_splay(k, tree) for tree in trees for k in {warm_keys}];"
             f"n = {n}"
         )
-        code_splay = "fibonacci_splay(n, tree)"
+        code_splay = "for tree in trees: fibonacci_splay(n, tree)"
 
         t_splay = measure_time(code_splay, setup_splay, number=repeat_count)
         results_splay.append(t_splay)
 
-        print(f"{n:<10} {t_lru:<20.8g} {t_splay:<20.8g}")
+        # ---------- List Cache заміри ----------
+        # Окремий список з warm_keys для кожного виклику
+        setup_list = (
+            "from __main__ import fibonacci_list, reset_list_cache;"
+            f"caches = [reset_list_cache() for _ in range({repeat_count})];"
+            f"[fibonacci_list(k, cache) for cache in caches for k in {warm_keys}];"
+            f"n = {n}"
+        )
+        code_list = "for cache in caches: fibonacci_list(n, cache)"
+
+        t_list = measure_time(code_list, setup_list, number=repeat_count)
+        results_list.append(t_list)
+
+        print(f"{n:<10} {t_lru:<20.8g} {t_splay:<20.8g} {t_list:<20.8g}")
+
+    # Побудова графіка. matplotlib імпортується лише тут, тож імпорт task_2 як модуля
+    # чи запуск без графічного середовища не завантажує pyplot
+    try:
+        import matplotlib.pyplot as plt
+    except ImportError:
+        print("matplotlib не встановлено - графік не буде побудовано")
+        return
 
-    # Побудова графіка
     plt.figure(figsize=(8, 5))
     plt.plot(ns, results_lru, 'o-', label="LRU Cache")
     plt.plot(ns, results_splay, 'x-', label="Splay Tree")
+    plt.plot(ns, results_list, 's-', label="List Cache")
 
-    plt.title("Порівняння часу виконання для LRU Cache та Splay Tree")
+    plt.title("Порівняння часу виконання для LRU Cache, Splay Tree та List Cache")
     plt.xlabel("Число Фібоначчі (n)")
-    plt.ylabel("Середній час виконання (секунди)")
+    plt.ylabel("Час виконання (секунди)")
     plt.legend()
     plt.grid(True)
 
@@ -232,25 +366,25 @@ def main():
 if __name__ == "__main__":
     main()
 
-    # n         LRU Cache Time (s)    Splay Tree Time (s)
-    # ----------------------------------------------------
-    # 0          6.1499886e-08        4.2699976e-07
-    # 50         7.7500008e-08        4.9100025e-07
-    # 100        8.3499472e-08        8.0000027e-07
-    # 150        9.1500115e-08        1.2755004e-06
-    # 200        1.0249962e-07        1.6644999e-06
-    # 250        1.1300028e-07        2.1565001e-06
-    # 300        1.2999983e-07        2.3400004e-06
-    # 350        1.3699988e-07        2.7414999e-06
-    # 400        1.7000013e-07        3.0164997e-06
-    # 450        1.6250007e-07        3.515e-06
-    # 500        1.7549959e-07        4.3490005e-06
-    # 550        1.8800027e-07        5.2290002e-06
-    # 600        2.5450019e-07        4.5499997e-06
-    # 650        2.164999e-07         4.8649998e-06
-    # 700        2.3550005e-07        5.4179999e-06
-    # 750        2.4400011e-07        6.7645003e-06
-    # 800        3.0399999e-07        9.1489998e-06
-    # 850        2.7199974e-07        6.4225e-06
-    # 900        2.8349983e-07        7.4049999e-06
-    # 950        3.055e-07            7.5049995e-06
+    # n         LRU Cache Time (s)    Splay Tree Time (s)   List Cache Time (s)
+    # --------------------------------------------------------------------------
+    # 0          1.5225e-07           3.76187e-06          1.4282e-07
+    # 50         1.5199e-07           4.977305e-06         1.21475e-07
+    # 100        1.52725e-07          4.620555e-06         1.20855e-07
+    # 150        1.52645e-07          4.437595e-06         2.24745e-07
+    # 200        2.1553e-07           4.278535e-06         1.2477e-07
+    # 250        1.5623e-07           3.935655e-06         1.09895e-07
+    # 300        1.5277e-07           4.087255e-06         1.27215e-07
+    # 350        1.51585e-07          3.776245e-06         1.22385e-07
+    # 400        1.46935e-07          3.456835e-06         1.2056e-07
+    # 450        1.437e-07            3.229995e-06         1.2303e-07
+    # 500        1.48045e-07          3.163955e-06         1.21e-07
+    # 550        1.44785e-07          2.84362e-06          1.22205e-07
+    # 600        1.46795e-07          2.7744e-06           1.11395e-07
+    # 650        1.4887e-07           2.522145e-06         1.21155e-07
+    # 700        1.4231e-07           2.45786e-06          1.1814e-07
+    # 750        1.3514e-07           2.148785e-06         1.25575e-07
+    # 800        1.56915e-07          2.188775e-06         1.20975e-07
+    # 850        1.488e-07            1.834645e-06         1.1417e-07
+    # 900        1.45535e-07          1.68955e-06          1.15155e-07
+    # 950        1.3922e-07           1.314845e-06         1.1042e-07